@@ -2,21 +2,36 @@
 """Taidy CLI - Smart linter/formatter with automatic tool detection."""
 
 import fnmatch
-import json
+import functools
 import logging
 import os
+import re
 import shutil
-import subprocess
+import stat
 import sys
-import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import defaultdict, deque
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
-
-# Version information - can be overridden at build time
-VERSION = "0.1.0"
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+)
+
+from . import __version__
+
+# Build information - can be overridden at build time
 GIT_COMMIT = "unknown"
 BUILD_DATE = "unknown"
 
@@ -77,8 +92,64 @@ CONFIGURATION_TEXT = """Configuration:
         "*.generated.*"
       ]
     }
+  Set TAIDY_NO_CONFIG=1 to ignore any .taidy.json files.
 """.strip()
 
+# Common directories to ignore (defaults)
+DEFAULT_IGNORE_PATTERNS: Tuple[str, ...] = (
+    ".git",
+    "node_modules",
+    "__pycache__",
+    ".pytest_cache",
+    "dist",
+    "build",
+    ".venv",
+    "venv",
+    ".env",
+    "env",
+    "*.egg-info",
+    ".mypy_cache",
+    ".ruff_cache",
+    ".coverage",
+)
+
+# File types included in security scanning when trufflehog is available
+SECURITY_EXTENSIONS: FrozenSet[str] = frozenset(
+    {
+        ".py",
+        ".js",
+        ".jsx",
+        ".ts",
+        ".tsx",
+        ".go",
+        ".rs",
+        ".rb",
+        ".php",
+        ".sh",
+        ".bash",
+        ".zsh",
+        ".yaml",
+        ".yml",
+        ".json",
+        ".toml",
+        ".tf",
+        ".tfvars",
+        ".env",
+        ".txt",
+        ".md",
+        ".sql",
+        ".xml",
+        ".html",
+        ".css",
+    }
+)
+
+# Long-running daemon versions of tools that accept the same arguments, used in
+# preference to the tool itself to avoid paying interpreter startup on every run
+DAEMON_TOOLS: Dict[str, str] = {
+    "eslint": "eslint_d",
+}
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -100,24 +171,86 @@ class Mode(Enum):
     FORMAT = "format"  # Format only
 
 
-@dataclass
+@dataclass(frozen=True)
 class LinterCommand:
     """Represents a linter command that can be tried"""
 
-    available: Callable[[], bool]
-    command: Callable[[List[str]], Tuple[str, List[str]]]
+    tool: str
+    args: Tuple[str, ...] = ()
     supports_directories: bool = False
+    # Flag to pass each custom ignore pattern to the tool with, when it accepts globs
+    exclude_flag: Optional[str] = None
+    # Whether the tool analyses its files as a whole, so splitting them changes results
+    cross_file: bool = False
+    # Whether the tool already spreads its files over every CPU itself
+    parallel: bool = False
+
+    def accepts_directories(self, ignore_patterns: Optional[Tuple[str, ...]]) -> bool:
+        """Check if the tool can be given directories rather than discovered files.
+
+        `ignore_patterns` are the custom ignores the tool would have to apply, or None
+        if there are ignores that only taidy's own directory walk can apply.
+        """
+        if not self.supports_directories or ignore_patterns is None:
+            return False
+        return not ignore_patterns or self.exclude_flag is not None
+
+    def signature(self) -> Tuple[str, Tuple[str, ...]]:
+        """Get the command and its fixed arguments, excluding any files"""
+        if self.tool == "trufflehog":
+            return ("trufflehog", _get_trufflehog_args(self.args))
+        daemon = DAEMON_TOOLS.get(self.tool)
+        if daemon and is_command_available(daemon):
+            return (daemon, self.args)
+        return (self.tool, self.args)
+
+
+@functools.cache
+def _path_executables() -> Dict[str, str]:
+    """Index files on PATH by command name, listing each PATH directory once.
+
+    The first match in PATH order wins, as it would for the shell.
+    """
+    windows = sys.platform == "win32"
+    if windows:
+        pathext = os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD").lower().split(os.pathsep)
+
+    executables: Dict[str, str] = {}
+    for directory in os.environ.get("PATH", os.defpath).split(os.pathsep):
+        if not directory:
+            continue
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+
+        for entry in entries:
+            name = entry.name
+            if windows:
+                stem, ext = os.path.splitext(name.lower())
+                name = stem if ext in pathext else name.lower()
+            executables.setdefault(name, entry.path)
+    return executables
 
 
-# Cache for command availability to avoid repeated shutil.which() calls
-_command_availability_cache: Dict[str, bool] = {}
+@functools.cache
+def resolve_command(cmd: str) -> Optional[str]:
+    """Get the absolute path a command in PATH would run, with caching"""
+    if os.path.dirname(cmd):
+        return shutil.which(cmd)
+
+    path = _path_executables().get(cmd.lower() if sys.platform == "win32" else cmd)
+    if path is None:
+        return None
+    if os.access(path, os.X_OK) and not os.path.isdir(path):
+        return path
+    # The first match isn't runnable, so let shutil.which look further along PATH
+    return shutil.which(cmd)
 
 
 def is_command_available(cmd: str) -> bool:
     """Check if a command is available in PATH, with caching"""
-    if cmd not in _command_availability_cache:
-        _command_availability_cache[cmd] = shutil.which(cmd) is not None
-    return _command_availability_cache[cmd]
+    return resolve_command(cmd) is not None
 
 
 def is_git_repository(directory: Path) -> bool:
@@ -142,6 +275,8 @@ def find_git_root(directory: Path) -> Optional[Path]:
 
 def get_git_ignored_files(git_root: Path) -> Set[Path]:
     """Get set of files ignored by git using git status --ignored"""
+    import subprocess
+
     ignored_files = set()
 
     try:
@@ -165,440 +300,308 @@ def get_git_ignored_files(git_root: Path) -> Set[Path]:
     return ignored_files
 
 
-def load_config(start_path: str = ".") -> Dict[str, Any]:
+def load_config(start_path: str = ".") -> Mapping[str, Any]:
     """Load configuration from .taidy.json file, searching up directory tree"""
-    current_path = Path(start_path).resolve()
+    if os.environ.get("TAIDY_NO_CONFIG"):
+        return MappingProxyType({})
+    return _load_config_cached(str(Path(start_path).resolve()))
 
-    # Search up directory tree for .taidy.json
-    for path in [current_path] + list(current_path.parents):
-        config_file = path / ".taidy.json"
-        if config_file.exists():
-            try:
-                with open(config_file, "r") as f:
-                    config = json.load(f) or {}
-                    return config
-            except Exception as e:
-                logger.warning(f"Failed to parse {config_file}: {e}")
-                return {}
 
-    return {}
+@functools.cache
+def _load_config_cached(resolved_path: str) -> Mapping[str, Any]:
+    """Load configuration for an already resolved path, cached per path.
 
+    Each directory defers to its parent's cached result when it has no config of its
+    own, so ancestors shared between start paths are only checked once. The result is
+    read-only because it is shared between callers.
+    """
+    import json
 
-def should_ignore_file(file_path: Path, ignore_patterns: List[str]) -> bool:
-    """Check if a file should be ignored based on ignore patterns"""
-    file_str = str(file_path)
+    config_file = os.path.join(resolved_path, ".taidy.json")
+    # Open directly rather than exists() + open() to save a stat per ancestor
+    try:
+        with open(config_file, "r") as f:
+            config = json.load(f) or {}
+        if not isinstance(config, dict):
+            raise ValueError("expected a JSON object")
+        return MappingProxyType(config)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Failed to parse {config_file}: {e}")
+        return MappingProxyType({})
 
-    for pattern in ignore_patterns:
-        # Check if pattern matches the full path
-        if fnmatch.fnmatch(file_str, pattern):
-            return True
+    # Search up directory tree for .taidy.json
+    parent = os.path.dirname(resolved_path)
+    if parent == resolved_path:
+        return MappingProxyType({})
+    return _load_config_cached(parent)
 
-        # Check if pattern matches any part of the path
-        if fnmatch.fnmatch(file_path.name, pattern):
-            return True
 
-        # Check if any parent directory matches the pattern
-        for part in file_path.parts:
-            if fnmatch.fnmatch(part, pattern):
-                return True
+@dataclass(frozen=True)
+class IgnoreMatcher:
+    """Compiled ignore patterns, split by how cheaply each kind can be matched"""
 
-    return False
+    names: FrozenSet[str]
+    suffixes: Tuple[str, ...]
+    regex: Optional[re.Pattern[str]]
+
+    def match(self, path: str) -> bool:
+        path = os.path.normcase(path)
+        if path in self.names or path.endswith(self.suffixes):
+            return True
+        return self.regex is not None and self.regex.match(path) is not None
+
+
+@functools.cache
+def compile_ignore_patterns(ignore_patterns: Tuple[str, ...]) -> IgnoreMatcher:
+    """Compile glob ignore patterns into a matcher for any of them"""
+    names = set()
+    suffixes = []
+    globs = []
+    for pattern in map(os.path.normcase, ignore_patterns):
+        if set(pattern).isdisjoint("*?["):
+            names.add(pattern)
+        elif pattern.startswith("*") and set(pattern[1:]).isdisjoint("*?["):
+            suffixes.append(pattern[1:])
+        else:
+            globs.append(pattern)
+
+    regex = None
+    if globs:
+        regex = re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in globs))
+    return IgnoreMatcher(frozenset(names), tuple(suffixes), regex)
 
 
-def _get_trufflehog_command(files: List[str]) -> Tuple[str, List[str]]:
-    """Get the appropriate trufflehog command based on git repository status."""
+def _get_trufflehog_args(filesystem_args: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Get the appropriate trufflehog arguments based on git repository status."""
     # Check if we're in a git repository
     current_dir = Path.cwd()
     if is_git_repository(current_dir):
         # Use git mode with max-depth=1 to scan current state while respecting gitignore
         # Use file:// URI for local git repository
         git_uri = f"file://{current_dir.absolute()}"
-        return (
-            "trufflehog",
-            ["git", "--max-depth=1", "--no-update", "--fail", "--log-level=-1", git_uri],
-        )
+        return ("git", "--max-depth=1", "--no-update", "--fail", "--log-level=-1", git_uri)
     else:
         # Use filesystem mode for non-git directories
-        return ("trufflehog", ["filesystem", "--no-update", "--fail", "--log-level=-1"] + files)
+        return filesystem_args
+
+
+def _walk_directory(
+    directory: Path, ignore_matcher: IgnoreMatcher, git_ignored_files: Set[str]
+) -> Iterator[Tuple[str, str]]:
+    """Walk a directory tree, yielding (path, name) for every file that isn't ignored.
+
+    Ignored directories are pruned rather than descended into, and only the
+    DirEntry type information from scandir is used, so no extra stat calls are made.
+    """
+    # Ignore patterns also apply to the components of the directory itself
+    if any(ignore_matcher.match(part) for part in directory.parts):
+        return
+
+    # Paths are built relative to the directory as given, matching Path.rglob()
+    root = str(directory)
+    pending = deque([(root if root != "." else "", str(directory.resolve()))])
+
+    while pending:
+        dir_path, resolved_dir = pending.popleft()
+        try:
+            # Sorted so that the order files are found in is stable between runs
+            entries = sorted(os.scandir(dir_path or "."), key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        for entry in entries:
+            name = entry.name
+            # DirEntry.path is already joined onto the directory that was scanned
+            path = entry.path if dir_path else name
+            resolved = os.path.join(resolved_dir, name) if git_ignored_files else ""
+
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not (ignore_matcher.match(name) or resolved in git_ignored_files):
+                        pending.append((path, resolved))
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+
+            if ignore_matcher.match(name) or ignore_matcher.match(path):
+                continue
+            if resolved in git_ignored_files:
+                continue
+
+            yield path, name
+
+
+# Path segment marking GitHub Actions workflow files
+_WORKFLOW_MARKER = os.sep.join(("", ".github", "workflows", ""))
+
+# Extensions that need a closer look, as some of their files are special cases
+_SPECIAL_CASE_EXTENSIONS: FrozenSet[str] = frozenset({"", ".just", ".yml", ".yaml"})
+
+# Lowercased names of files that are justfiles
+_JUSTFILE_NAMES: FrozenSet[str] = frozenset({"justfile", "justfile.just"})
+
+
+def classify_file(file_path: str, name: Optional[str] = None) -> str:
+    """Get the extension used to look up tools for a file, handling special cases"""
+    name_lower = (os.path.basename(file_path) if name is None else name).lower()
+    ext = os.path.splitext(name_lower)[1]
+    if ext not in _SPECIAL_CASE_EXTENSIONS:
+        return ext
+
+    # Special case: Justfile files
+    if name_lower in _JUSTFILE_NAMES:
+        return "justfile"
 
+    # Special case: GitHub Actions workflow files
+    if (ext == ".yml" or ext == ".yaml") and (os.sep + file_path).find(_WORKFLOW_MARKER) != -1:
+        return ".github-workflow"
 
-def discover_files_in_directory(directory_path: str) -> List[str]:
-    """Discover all supported files in a directory recursively"""
-    supported_extensions: Set[str] = set()
-    supported_extensions.update(LINTER_MAP.keys())
-    supported_extensions.update(FORMATTER_MAP.keys())
+    return ext
 
+
+def iter_discovered_files(directory_path: str) -> Iterator[Tuple[str, str]]:
+    """Discover supported files in a directory recursively.
+
+    Yields (mapped extension, path) pairs as the directory is walked, so callers can
+    start grouping files before the walk has finished.
+    """
     # Load config and get ignore patterns
     config = load_config(directory_path)
     config_ignores = config.get("ignore", [])
 
-    # Common directories to ignore (defaults)
-    default_ignore_patterns = [
-        ".git",
-        "node_modules",
-        "__pycache__",
-        ".pytest_cache",
-        "dist",
-        "build",
-        ".venv",
-        "venv",
-        ".env",
-        "env",
-        "*.egg-info",
-        ".mypy_cache",
-        ".ruff_cache",
-        ".coverage",
-    ]
-
     # Combine default and config ignore patterns
-    all_ignore_patterns = default_ignore_patterns + config_ignores
+    ignore_matcher = compile_ignore_patterns((*DEFAULT_IGNORE_PATTERNS, *config_ignores))
 
-    discovered_files = []
     directory = Path(directory_path)
 
     # Check if directory is in a git repository and get ignored files
-    git_ignored_files = set()
+    git_ignored_files: Set[str] = set()
     if is_git_repository(directory):
         git_root = find_git_root(directory)
         if git_root:
-            git_ignored_files = get_git_ignored_files(git_root)
-
-    for file_path in directory.rglob("*"):
-        # Skip if it's not a file
-        if not file_path.is_file():
-            continue
-
-        # Skip if file should be ignored by taidy patterns
-        if should_ignore_file(file_path, all_ignore_patterns):
-            continue
-
-        # Skip if file should be ignored by git (only if we're in a git repo)
-        if file_path.resolve() in git_ignored_files:
-            continue
-
-        # Check if extension is supported
-        ext = file_path.suffix.lower()
-        is_supported = ext in supported_extensions
-
-        # Special case: Justfile files
-        if not is_supported and file_path.name.lower() in ["justfile", "justfile.just"]:
-            is_supported = True
-
-        # Special case: GitHub Actions workflow files
-        if not is_supported and file_path.suffix.lower() in [".yml", ".yaml"]:
-            if ".github/workflows" in str(file_path):
-                is_supported = True
-
-        # Special case: Security scanning - include all files if trufflehog is available
-        if not is_supported and is_command_available("trufflehog"):
-            # Include most common file types for security scanning
-            security_extensions = {
-                ".py",
-                ".js",
-                ".jsx",
-                ".ts",
-                ".tsx",
-                ".go",
-                ".rs",
-                ".rb",
-                ".php",
-                ".sh",
-                ".bash",
-                ".zsh",
-                ".yaml",
-                ".yml",
-                ".json",
-                ".toml",
-                ".tf",
-                ".tfvars",
-                ".env",
-                ".txt",
-                ".md",
-                ".sql",
-                ".xml",
-                ".html",
-                ".css",
-            }
-            if ext in security_extensions or file_path.name.startswith(".env"):
-                is_supported = True
-
-        if not is_supported:
-            continue
-
-        discovered_files.append(str(file_path))
-
-    return sorted(discovered_files)
-
+            git_ignored_files = {str(path) for path in get_git_ignored_files(git_root)}
+
+    # Security scanning includes extra file types if trufflehog is available
+    scan_security = is_command_available("trufflehog")
+
+    for file_path, name in _walk_directory(directory, ignore_matcher, git_ignored_files):
+        mapped_ext = classify_file(file_path, name)
+        if mapped_ext in SUPPORTED_EXTENSIONS:
+            yield mapped_ext, file_path
+        elif scan_security and (mapped_ext in SECURITY_EXTENSIONS or name.startswith(".env")):
+            yield mapped_ext, file_path
+
+
+# Commands shared between several file types
+PRETTIER_CHECK = LinterCommand("prettier", ("--check", "--log-level", "error"))
+PRETTIER_WRITE = LinterCommand(
+    "prettier", ("--write", "--log-level", "error"), supports_directories=True
+)
+SHELL_LINTERS: Tuple[LinterCommand, ...] = (
+    LinterCommand("shellcheck", ("-S", "warning")),
+    LinterCommand("beautysh", ("--check",)),
+)
+SHELL_FORMATTERS: Tuple[LinterCommand, ...] = (
+    LinterCommand("shfmt", ("-w",)),
+    LinterCommand("beautysh"),
+)
+TERRAFORM_LINTERS: Tuple[LinterCommand, ...] = (
+    LinterCommand("terraform", ("validate",)),
+    LinterCommand("tflint", ("--quiet",)),
+)
 
 # LinterConfig maps file extensions to sequences of linter commands to try in order
 LINTER_MAP: Dict[str, List[LinterCommand]] = {
     ".py": [
         LinterCommand(
-            available=lambda: is_command_available("ruff"),
-            command=lambda files: ("ruff", ["check", "--quiet"] + files),
-            supports_directories=True,
+            "ruff", ("check", "--quiet"), supports_directories=True, exclude_flag="--extend-exclude"
         ),
         LinterCommand(
-            available=lambda: is_command_available("uvx"),
-            command=lambda files: ("uvx", ["ruff", "check", "--quiet"] + files),
+            "uvx",
+            ("ruff", "check", "--quiet"),
             supports_directories=True,
+            exclude_flag="--extend-exclude",
         ),
-        LinterCommand(
-            available=lambda: is_command_available("black"),
-            command=lambda files: ("black", ["--check", "--quiet"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("flake8"),
-            command=lambda files: ("flake8", ["--quiet"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("pylint"),
-            command=lambda files: ("pylint", ["--quiet"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("python"),
-            command=lambda files: ("python", ["-m", "py_compile"] + files),
-        ),
+        LinterCommand("black", ("--check", "--quiet"), parallel=True),
+        LinterCommand("flake8", ("--quiet",), parallel=True),
+        LinterCommand("pylint", ("--quiet",), cross_file=True),
+        LinterCommand("python", ("-m", "py_compile")),
     ],
     ".js": [
-        LinterCommand(
-            available=lambda: is_command_available("eslint"),
-            command=lambda files: ("eslint", ["--quiet"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--check", "--log-level", "error"] + files,
-            ),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("node"),
-            command=lambda files: ("node", ["--check"] + files),
-        ),
+        LinterCommand("eslint", ("--quiet",)),
+        PRETTIER_CHECK,
+        LinterCommand("node", ("--check",)),
     ],
     ".jsx": [
-        LinterCommand(
-            available=lambda: is_command_available("eslint"),
-            command=lambda files: ("eslint", ["--quiet"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--check", "--log-level", "error"] + files,
-            ),
-        ),
+        LinterCommand("eslint", ("--quiet",)),
+        PRETTIER_CHECK,
     ],
     ".ts": [
-        LinterCommand(
-            available=lambda: is_command_available("eslint"),
-            command=lambda files: ("eslint", ["--quiet"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("tsc"),
-            command=lambda files: ("tsc", ["--noEmit"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--check", "--log-level", "error"] + files,
-            ),
-        ),
+        LinterCommand("eslint", ("--quiet",)),
+        LinterCommand("tsc", ("--noEmit",), cross_file=True),
+        PRETTIER_CHECK,
     ],
     ".tsx": [
-        LinterCommand(
-            available=lambda: is_command_available("eslint"),
-            command=lambda files: ("eslint", ["--quiet"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("tsc"),
-            command=lambda files: ("tsc", ["--noEmit"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--check", "--log-level", "error"] + files,
-            ),
-        ),
+        LinterCommand("eslint", ("--quiet",)),
+        LinterCommand("tsc", ("--noEmit",), cross_file=True),
+        PRETTIER_CHECK,
     ],
     ".json": [
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--check", "--log-level", "error"] + files,
-            ),
-        ),
+        PRETTIER_CHECK,
     ],
     ".css": [
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--check", "--log-level", "error"] + files,
-            ),
-        ),
+        PRETTIER_CHECK,
     ],
     ".scss": [
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--check", "--log-level", "error"] + files,
-            ),
-        ),
+        PRETTIER_CHECK,
     ],
     ".html": [
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--check", "--log-level", "error"] + files,
-            ),
-        ),
+        PRETTIER_CHECK,
     ],
     ".md": [
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--check", "--log-level", "error"] + files,
-            ),
-        ),
+        PRETTIER_CHECK,
     ],
     ".go": [
-        LinterCommand(
-            available=lambda: is_command_available("gofmt"),
-            command=lambda files: ("gofmt", ["-l"] + files),
-        ),
+        LinterCommand("gofmt", ("-l",)),
     ],
     ".rs": [
-        LinterCommand(
-            available=lambda: is_command_available("rustfmt"),
-            command=lambda files: ("rustfmt", ["--check", "--quiet"] + files),
-        ),
+        LinterCommand("rustfmt", ("--check", "--quiet")),
     ],
     ".rb": [
-        LinterCommand(
-            available=lambda: is_command_available("rubocop"),
-            command=lambda files: ("rubocop", ["--quiet"] + files),
-        ),
+        LinterCommand("rubocop", ("--quiet",)),
     ],
     ".php": [
-        LinterCommand(
-            available=lambda: is_command_available("php-cs-fixer"),
-            command=lambda files: (
-                "php-cs-fixer",
-                ["fix", "--dry-run", "--quiet"] + files,
-            ),
-        ),
-    ],
-    ".sh": [
-        LinterCommand(
-            available=lambda: is_command_available("shellcheck"),
-            command=lambda files: ("shellcheck", ["-S", "warning"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("beautysh"),
-            command=lambda files: ("beautysh", ["--check"] + files),
-        ),
-    ],
-    ".bash": [
-        LinterCommand(
-            available=lambda: is_command_available("shellcheck"),
-            command=lambda files: ("shellcheck", ["-S", "warning"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("beautysh"),
-            command=lambda files: ("beautysh", ["--check"] + files),
-        ),
-    ],
-    ".zsh": [
-        LinterCommand(
-            available=lambda: is_command_available("shellcheck"),
-            command=lambda files: ("shellcheck", ["-S", "warning"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("beautysh"),
-            command=lambda files: ("beautysh", ["--check"] + files),
-        ),
+        LinterCommand("php-cs-fixer", ("fix", "--dry-run", "--quiet")),
     ],
+    ".sh": [*SHELL_LINTERS],
+    ".bash": [*SHELL_LINTERS],
+    ".zsh": [*SHELL_LINTERS],
     ".yaml": [
-        LinterCommand(
-            available=lambda: is_command_available("yamllint"),
-            command=lambda files: ("yamllint", ["--quiet"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--check", "--log-level", "error"] + files,
-            ),
-        ),
+        LinterCommand("yamllint", ("--quiet",)),
+        PRETTIER_CHECK,
     ],
     ".yml": [
-        LinterCommand(
-            available=lambda: is_command_available("yamllint"),
-            command=lambda files: ("yamllint", ["--quiet"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--check", "--log-level", "error"] + files,
-            ),
-        ),
+        LinterCommand("yamllint", ("--quiet",)),
+        PRETTIER_CHECK,
     ],
     ".toml": [
-        LinterCommand(
-            available=lambda: is_command_available("taplo"),
-            command=lambda files: ("taplo", ["check"] + files),
-        ),
-    ],
-    ".tf": [
-        LinterCommand(
-            available=lambda: is_command_available("terraform"),
-            command=lambda files: ("terraform", ["validate"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("tflint"),
-            command=lambda files: ("tflint", ["--quiet"] + files),
-        ),
-    ],
-    ".tfvars": [
-        LinterCommand(
-            available=lambda: is_command_available("terraform"),
-            command=lambda files: ("terraform", ["validate"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("tflint"),
-            command=lambda files: ("tflint", ["--quiet"] + files),
-        ),
+        LinterCommand("taplo", ("check",)),
     ],
+    ".tf": [*TERRAFORM_LINTERS],
+    ".tfvars": [*TERRAFORM_LINTERS],
     ".github-workflow": [
-        LinterCommand(
-            available=lambda: is_command_available("actionlint"),
-            command=lambda files: ("actionlint", ["-quiet"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("yamllint"),
-            command=lambda files: ("yamllint", ["--quiet"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--check", "--log-level", "error"] + files,
-            ),
-        ),
+        LinterCommand("actionlint", ("-quiet",)),
+        LinterCommand("yamllint", ("--quiet",)),
+        PRETTIER_CHECK,
     ],
     ".security": [
         LinterCommand(
-            available=lambda: is_command_available("trufflehog"),
-            command=lambda files: _get_trufflehog_command(files),
+            "trufflehog",
+            ("filesystem", "--no-update", "--fail", "--log-level=-1"),
             supports_directories=True,
         ),
     ],
@@ -608,242 +611,151 @@ LINTER_MAP: Dict[str, List[LinterCommand]] = {
 FORMATTER_MAP: Dict[str, List[LinterCommand]] = {
     ".py": [
         LinterCommand(
-            available=lambda: is_command_available("ruff"),
-            command=lambda files: ("ruff", ["format", "--quiet"] + files),
+            "ruff",
+            ("format", "--quiet"),
             supports_directories=True,
+            exclude_flag="--extend-exclude",
         ),
         LinterCommand(
-            available=lambda: is_command_available("uvx"),
-            command=lambda files: ("uvx", ["ruff", "format", "--quiet"] + files),
-            supports_directories=True,
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("black"),
-            command=lambda files: ("black", ["--quiet"] + files),
+            "uvx",
+            ("ruff", "format", "--quiet"),
             supports_directories=True,
+            exclude_flag="--extend-exclude",
         ),
+        LinterCommand("black", ("--quiet",), supports_directories=True),
     ],
     ".js": [
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--write", "--log-level", "error"] + files,
-            ),
-            supports_directories=True,
-        ),
+        PRETTIER_WRITE,
     ],
     ".jsx": [
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--write", "--log-level", "error"] + files,
-            ),
-            supports_directories=True,
-        ),
+        PRETTIER_WRITE,
     ],
     ".ts": [
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--write", "--log-level", "error"] + files,
-            ),
-            supports_directories=True,
-        ),
+        PRETTIER_WRITE,
     ],
     ".tsx": [
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--write", "--log-level", "error"] + files,
-            ),
-            supports_directories=True,
-        ),
+        PRETTIER_WRITE,
     ],
     ".json": [
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--write", "--log-level", "error"] + files,
-            ),
-            supports_directories=True,
-        ),
+        PRETTIER_WRITE,
     ],
     ".css": [
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--write", "--log-level", "error"] + files,
-            ),
-            supports_directories=True,
-        ),
+        PRETTIER_WRITE,
     ],
     ".scss": [
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--write", "--log-level", "error"] + files,
-            ),
-            supports_directories=True,
-        ),
+        PRETTIER_WRITE,
     ],
     ".html": [
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--write", "--log-level", "error"] + files,
-            ),
-            supports_directories=True,
-        ),
+        PRETTIER_WRITE,
     ],
     ".md": [
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--write", "--log-level", "error"] + files,
-            ),
-            supports_directories=True,
-        ),
+        PRETTIER_WRITE,
     ],
     ".pug": [
         LinterCommand(
-            available=lambda: is_command_available("bunx"),
-            command=lambda files: (
-                "bunx",
-                ["prettier", "--write", "--plugin=@prettier/plugin-pug"] + files,
-            ),
+            "bunx",
+            ("prettier", "--write", "--plugin=@prettier/plugin-pug"),
             supports_directories=True,
         ),
         LinterCommand(
-            available=lambda: is_command_available("npx"),
-            command=lambda files: (
-                "npx",
-                ["prettier", "--write", "--plugin=@prettier/plugin-pug"] + files,
-            ),
+            "npx",
+            ("prettier", "--write", "--plugin=@prettier/plugin-pug"),
             supports_directories=True,
         ),
     ],
     ".go": [
-        LinterCommand(
-            available=lambda: is_command_available("gofmt"),
-            command=lambda files: ("gofmt", ["-w"] + files),
-            supports_directories=True,
-        ),
+        LinterCommand("gofmt", ("-w",), supports_directories=True),
     ],
     ".rs": [
-        LinterCommand(
-            available=lambda: is_command_available("rustfmt"),
-            command=lambda files: ("rustfmt", ["--quiet"] + files),
-            supports_directories=True,
-        ),
+        LinterCommand("rustfmt", ("--quiet",), supports_directories=True),
     ],
     ".rb": [
-        LinterCommand(
-            available=lambda: is_command_available("rubocop"),
-            command=lambda files: ("rubocop", ["-a", "--quiet"] + files),
-            supports_directories=True,
-        ),
+        LinterCommand("rubocop", ("-a", "--quiet"), supports_directories=True),
     ],
     ".php": [
-        LinterCommand(
-            available=lambda: is_command_available("php-cs-fixer"),
-            command=lambda files: ("php-cs-fixer", ["fix", "--quiet"] + files),
-        ),
-    ],
-    ".sh": [
-        LinterCommand(
-            available=lambda: is_command_available("shfmt"),
-            command=lambda files: ("shfmt", ["-w"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("beautysh"),
-            command=lambda files: ("beautysh", files),
-        ),
-    ],
-    ".bash": [
-        LinterCommand(
-            available=lambda: is_command_available("shfmt"),
-            command=lambda files: ("shfmt", ["-w"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("beautysh"),
-            command=lambda files: ("beautysh", files),
-        ),
-    ],
-    ".zsh": [
-        LinterCommand(
-            available=lambda: is_command_available("shfmt"),
-            command=lambda files: ("shfmt", ["-w"] + files),
-        ),
-        LinterCommand(
-            available=lambda: is_command_available("beautysh"),
-            command=lambda files: ("beautysh", files),
-        ),
+        LinterCommand("php-cs-fixer", ("fix", "--quiet")),
     ],
+    ".sh": [*SHELL_FORMATTERS],
+    ".bash": [*SHELL_FORMATTERS],
+    ".zsh": [*SHELL_FORMATTERS],
     ".yaml": [
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--write", "--log-level", "error"] + files,
-            ),
-            supports_directories=True,
-        ),
+        PRETTIER_WRITE,
     ],
     ".yml": [
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--write", "--log-level", "error"] + files,
-            ),
-            supports_directories=True,
-        ),
+        PRETTIER_WRITE,
     ],
     ".toml": [
-        LinterCommand(
-            available=lambda: is_command_available("taplo"),
-            command=lambda files: ("taplo", ["format"] + files),
-        ),
+        LinterCommand("taplo", ("format",)),
     ],
     ".tf": [
-        LinterCommand(
-            available=lambda: is_command_available("terraform"),
-            command=lambda files: ("terraform", ["fmt"] + files),
-        ),
+        LinterCommand("terraform", ("fmt",)),
     ],
     ".tfvars": [
-        LinterCommand(
-            available=lambda: is_command_available("terraform"),
-            command=lambda files: ("terraform", ["fmt"] + files),
-        ),
+        LinterCommand("terraform", ("fmt",)),
     ],
     ".github-workflow": [
-        LinterCommand(
-            available=lambda: is_command_available("prettier"),
-            command=lambda files: (
-                "prettier",
-                ["--write", "--log-level", "error"] + files,
-            ),
-            supports_directories=True,
-        ),
+        PRETTIER_WRITE,
     ],
     "justfile": [
-        LinterCommand(
-            available=lambda: is_command_available("just"),
-            command=lambda files: ("just", ["--fmt", "--unstable"]),
-        ),
+        LinterCommand("just", ("--fmt", "--unstable")),
     ],
 }
 
+# All extensions that have a linter or formatter configured
+SUPPORTED_EXTENSIONS: FrozenSet[str] = frozenset(LINTER_MAP) | frozenset(FORMATTER_MAP)
+
+
+def _first_available(commands: List[LinterCommand]) -> Optional[LinterCommand]:
+    """Get the first command whose tool is installed"""
+    for command in commands:
+        if is_command_available(command.tool):
+            return command
+    return None
+
+
+@functools.cache
+def resolve_linter(ext: str) -> Optional[LinterCommand]:
+    """Get the linter that will be used for an extension, if any is installed"""
+    return _first_available(LINTER_MAP.get(ext, []))
+
+
+@functools.cache
+def resolve_formatter(ext: str) -> Optional[LinterCommand]:
+    """Get the formatter that will be used for an extension, if any is installed"""
+    return _first_available(FORMATTER_MAP.get(ext, []))
+
+
+# Extensions with tools configured for each mode
+MODE_EXTENSIONS: Dict[Mode, FrozenSet[str]] = {
+    Mode.LINT: frozenset(LINTER_MAP),
+    Mode.FORMAT: frozenset(FORMATTER_MAP),
+    Mode.BOTH: SUPPORTED_EXTENSIONS,
+}
+
+# How to find the tools each mode runs for an extension, in the order they run
+MODE_RESOLVERS: Dict[Mode, Tuple[Callable[[str], Optional[LinterCommand]], ...]] = {
+    Mode.LINT: (resolve_linter,),
+    Mode.FORMAT: (resolve_formatter,),
+    Mode.BOTH: (resolve_linter, resolve_formatter),
+}
+
+# Commands given all their files at once rather than split up across CPUs. Those
+# that take whole directories, and black and flake8, spread the work over every CPU
+# themselves, and cross-file checks like tsc and pylint would miss problems between
+# chunks.
+UNSPLIT_COMMANDS: FrozenSet[Tuple[str, Tuple[str, ...]]] = frozenset(
+    (command.tool, command.args)
+    for commands in (*LINTER_MAP.values(), *FORMATTER_MAP.values())
+    for command in commands
+    if command.supports_directories or command.parallel or command.cross_file
+)
+
+# The fewest files worth starting a separate process for
+MIN_CHUNK_FILES = 64
+
+# How much of a command line is shown when it's run, unless debug logging is on
+MAX_LOGGED_ARGS = 8
+
 
 def show_usage() -> None:
     """Show usage information"""
@@ -861,332 +773,402 @@ def show_help() -> None:
 
 def show_version() -> None:
     """Show version information"""
-    print(f"Taidy {VERSION}")
+    print(f"Taidy {__version__}")
     if GIT_COMMIT != "unknown":
         print(f"Git commit: {GIT_COMMIT}")
     if BUILD_DATE != "unknown":
         print(f"Built: {BUILD_DATE}")
 
 
-# Thread-safe output lock
-output_lock = threading.Lock()
-
+def _write_output(stream: TextIO, data: bytes) -> None:
+    """Write a command's raw output to one of our own output streams"""
+    buffer = getattr(stream, "buffer", None)
+    if buffer is None:
+        stream.write(data.decode(errors="replace"))
+        stream.flush()
+        return
+    # Flush pending text (such as log lines) first so output stays in order
+    stream.flush()
+    buffer.write(data)
+    buffer.flush()
 
-def execute_batched_command(
-    cmd_signature: Tuple[str, Tuple[str, ...]], file_list: List[str]
-) -> int:
-    """Execute a batched command with deduplicated file list"""
-    cmd, base_args = cmd_signature
 
-    # Remove duplicates from file list while preserving order
-    unique_files = []
-    seen = set()
-    for file in file_list:
-        if file not in seen:
-            seen.add(file)
-            unique_files.append(file)
-
-    # Special handling for commands that don't take file arguments
-    if cmd == "just" and "--fmt" in base_args:
-        # just --fmt operates on the justfile in the current directory
-        args = list(base_args)
-    elif cmd == "trufflehog" and "git" in base_args:
-        # trufflehog git mode scans the repository, doesn't take file arguments
-        args = list(base_args)
+@functools.cache
+def _argv_budget() -> int:
+    """Get how many bytes of arguments a single command can be given"""
+    try:
+        arg_max = os.sysconf("SC_ARG_MAX")
+    except (AttributeError, ValueError, OSError):
+        arg_max = -1
+    if arg_max <= 0:
+        arg_max = 32767  # The Windows command line limit
+
+    # The environment shares the same space, and leave headroom for what the tool adds
+    environ_size = sum(_arg_size(f"{key}={value}") for key, value in os.environ.items())
+    return max(arg_max - environ_size - 4096, 4096)
+
+
+def _arg_size(arg: str) -> int:
+    """Get the bytes an argument takes up, including its null byte and argv pointer"""
+    return len(os.fsencode(arg)) + 1 + 8
+
+
+def _chunk_argv(
+    base_argv: List[str], files: List[str], max_files: Optional[int] = None
+) -> Iterator[List[str]]:
+    """Split files across as few command lines as fit within the argument size limit"""
+    budget = _argv_budget()
+    base_size = sum(map(_arg_size, base_argv))
+
+    argv = list(base_argv)
+    size = base_size
+    for file in files:
+        file_size = _arg_size(file)
+        file_count = len(argv) - len(base_argv)
+        if file_count and (size + file_size > budget or file_count == max_files):
+            yield argv
+            argv = list(base_argv)
+            size = base_size
+        argv.append(file)
+        size += file_size
+    yield argv
+
+
+def _describe_argv(argv: List[str]) -> str:
+    """Describe a command line for logging, abbreviating a long list of files"""
+    if len(argv) <= MAX_LOGGED_ARGS or logger.isEnabledFor(logging.DEBUG):
+        return " ".join(argv)
+    remaining = len(argv) - MAX_LOGGED_ARGS
+    return f"{' '.join(argv[:MAX_LOGGED_ARGS])} ... ({remaining} more)"
+
+
+async def _run_command(cmd: str, argv: List[str], inherit_output: bool) -> int:
+    """Run one command line, returning its exit code"""
+    # asyncio is the bulk of our import time, so like the other modules only some
+    # commands need, it's imported where it's used to keep --help and --version fast
+    import asyncio
+
+    logger.info(f"Running: {_describe_argv(argv)}")
+
+    # Run the path we already found, so the PATH isn't searched again for every spawn
+    argv[0] = resolve_command(cmd) or cmd
+
+    if inherit_output:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        stream = None
     else:
-        # Build final command with files
-        args = list(base_args) + unique_files
-
-    with output_lock:
-        logger.info(f"Running: {cmd} {' '.join(args)}")
+        stream = asyncio.subprocess.PIPE
 
     try:
-        result = subprocess.run([cmd] + args, capture_output=True, text=True)
-
-        # Print output atomically to avoid mixing
-        with output_lock:
-            if result.stdout:
-                print(result.stdout, end="", flush=True)
-            if result.stderr:
-                print(result.stderr, end="", file=sys.stderr, flush=True)
-
-        return result.returncode
+        process = await asyncio.create_subprocess_exec(*argv, stdout=stream, stderr=stream)
+        stdout, stderr = await process.communicate()
     except FileNotFoundError:
-        with output_lock:
-            logger.error(f"Error executing {cmd}: command not found")
+        logger.error("Error executing %s: command not found", cmd)
         return 127  # Standard exit code for command not found
     except Exception as e:
-        with output_lock:
-            logger.error(f"Error executing {cmd}: {e}")
+        logger.error("Error executing %s: %s", cmd, e)
         return 1  # General error
 
+    # Output is written in one go once the command finishes. Everything runs on the
+    # event loop thread, so output from concurrent commands can't interleave.
+    if stdout:
+        _write_output(sys.stdout, stdout)
+    if stderr:
+        _write_output(sys.stderr, stderr)
 
-def execute_linters(commands: List[LinterCommand], file_list: List[str]) -> int:
-    """Try each command in order until one is available"""
-    for linter_cmd in commands:
-        if linter_cmd.available():
-            cmd, args = linter_cmd.command(file_list)
+    # A command killed by a signal reports it negated, which we report as a shell would
+    returncode = process.returncode or 0
+    return 128 - returncode if returncode < 0 else returncode
 
-            with output_lock:
-                logger.info(f"Running: {cmd} {' '.join(args)}")
 
-            try:
-                result = subprocess.run([cmd] + args, capture_output=True, text=True)
-
-                # Print output atomically to avoid mixing
-                with output_lock:
-                    if result.stdout:
-                        print(result.stdout, end="", flush=True)
-                    if result.stderr:
-                        print(result.stderr, end="", file=sys.stderr, flush=True)
-
-                return result.returncode
-            except FileNotFoundError:
-                with output_lock:
-                    logger.error(f"Error executing {cmd}: command not found")
-                return 127  # Standard exit code for command not found
-            except Exception as e:
-                with output_lock:
-                    logger.error(f"Error executing {cmd}: {e}")
-                return 1  # General error
-
-    return 2  # No available command found
-
-
-def process_file_group(
-    ext: str,
-    file_list: List[str],
-    mode: Mode,
-    original_dirs: Optional[List[str]] = None,
-    has_custom_ignores: bool = False,
-) -> int:
-    """Process a group of files with the same extension"""
-    exit_code = 0
-
-    if mode in [Mode.LINT, Mode.BOTH]:
-        if ext in LINTER_MAP:
-            # Check if we can use directory processing for linters
-            inputs = file_list
-            if original_dirs and not has_custom_ignores:
-                # Find the first available linter that supports directories
-                for linter_cmd in LINTER_MAP[ext]:
-                    if linter_cmd.available() and linter_cmd.supports_directories:
-                        inputs = original_dirs
-                        break
-
-            result = execute_linters(LINTER_MAP[ext], inputs)
-            if result == 2:
-                with output_lock:
-                    logger.warning(f"No available linter found for {ext} files")
-            elif result != 0:
-                exit_code = result
-
-    if mode in [Mode.FORMAT, Mode.BOTH]:
-        if ext in FORMATTER_MAP:
-            # Check if we can use directory processing for formatters
-            inputs = file_list
-            if original_dirs and not has_custom_ignores:
-                # Find the first available formatter that supports directories
-                for formatter_cmd in FORMATTER_MAP[ext]:
-                    if formatter_cmd.available() and formatter_cmd.supports_directories:
-                        inputs = original_dirs
-                        break
+def _batched_argvs(
+    cmd_signature: Tuple[str, Tuple[str, ...]], file_list: List[str]
+) -> List[List[str]]:
+    """Build the command lines for a batched command with deduplicated file list
+
+    Files are passed to as few command lines as the OS argument size limit allows.
+    Tools that check each file on its own, on a single CPU, have large batches split
+    into one command line per CPU, so the chunks can run in parallel.
+    """
+    cmd, base_args = cmd_signature
 
-            result = execute_linters(FORMATTER_MAP[ext], inputs)
-            if result == 2:
-                with output_lock:
-                    logger.warning(f"No available formatter found for {ext} files")
-            elif result != 0:
-                exit_code = result
+    # Remove duplicates from file list while preserving order
+    unique_files = list(dict.fromkeys(file_list))
 
-    return exit_code
+    base_argv = [cmd, *base_args]
 
+    # Special handling for commands that don't take file arguments: just --fmt operates
+    # on the justfile in the current directory, and trufflehog git mode scans the repository
+    if (cmd == "just" and "--fmt" in base_args) or (cmd == "trufflehog" and "git" in base_args):
+        return [base_argv]
 
-def process_files(files: List[str], mode: Mode) -> int:
-    """Process files according to the specified mode"""
-    # Track which inputs were directories for potential direct passing to formatters
-    input_directories = [f for f in files if os.path.isdir(f) and os.path.exists(f)]
+    max_files = None
+    if cmd_signature not in UNSPLIT_COMMANDS:
+        per_cpu = -(-len(unique_files) // (os.cpu_count() or 1))
+        max_files = max(per_cpu, MIN_CHUNK_FILES)
+
+    return list(_chunk_argv(base_argv, unique_files, max_files))
 
-    # Check if we have custom ignore patterns (beyond the defaults)
-    config = load_config(".")
-    config_ignores = config.get("ignore", [])
-    has_custom_ignores = len(config_ignores) > 0
 
-    # Expand directories to files
-    expanded_files = []
+def exec_batched_command(cmd_signature: Tuple[str, Tuple[str, ...]], file_list: List[str]) -> None:
+    """Replace this process with a batched command, if it is a single command line.
+
+    Returns without doing anything if the command can't be handed off like this.
+    """
+    argvs = _batched_argvs(cmd_signature, file_list)
+    path = resolve_command(cmd_signature[0])
+    # Elsewhere exec only emulates replacing the process, and loses the exit code
+    if os.name != "posix" or len(argvs) != 1 or path is None:
+        return
+
+    logger.info(f"Running: {_describe_argv(argvs[0])}")
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        os.execv(path, argvs[0])
+    except OSError as e:
+        logger.debug(f"Could not hand off to {cmd_signature[0]}: {e}")
+
+
+async def execute_batches(command_batches: Dict[Tuple[str, Tuple[str, ...]], List[str]]) -> int:
+    """Run batched commands concurrently, returning the highest exit code.
+
+    Commands for different tools run in parallel. Commands for the same tool (such as
+    `ruff check` and `ruff format`) run one after the other in the order they were
+    batched, so a formatter never rewrites files while its own linter is reading them.
+    A batch too big for one command line is split into chunks that run in parallel.
+    """
+    import asyncio
+
+    # Bound concurrency to the number of CPUs, as the tools themselves are CPU bound
+    semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+
+    lanes: DefaultDict[str, List[Tuple[Tuple[str, Tuple[str, ...]], List[str]]]] = defaultdict(list)
+    for cmd_signature, file_list in command_batches.items():
+        lanes[cmd_signature[0]].append((cmd_signature, file_list))
+
+    # A single lane runs its commands one at a time, so they can share our output
+    inherit_output = len(lanes) == 1
+
+    async def run_argv(cmd: str, argv: List[str], inherit: bool) -> int:
+        async with semaphore:
+            return await _run_command(cmd, argv, inherit)
+
+    async def run_batch(cmd_signature: Tuple[str, Tuple[str, ...]], file_list: List[str]) -> int:
+        try:
+            argvs = _batched_argvs(cmd_signature, file_list)
+            # Chunks of one batch cover different files, so they can run side by side
+            inherit = inherit_output and len(argvs) == 1
+            results = await asyncio.gather(
+                *(run_argv(cmd_signature[0], argv, inherit) for argv in argvs)
+            )
+            return max(results)
+        except Exception as e:
+            logger.error("Error executing %s: %s", cmd_signature[0], e)
+            return 1
+
+    async def run_lane(lane: List[Tuple[Tuple[str, Tuple[str, ...]], List[str]]]) -> int:
+        return max([await run_batch(*batch) for batch in lane], default=0)
+
+    # Start the biggest lanes first, so a large one isn't left running alone at the end
+    ordered_lanes = sorted(
+        lanes.values(), key=lambda lane: sum(len(file_list) for _, file_list in lane), reverse=True
+    )
+    return max(await asyncio.gather(*(run_lane(lane) for lane in ordered_lanes)), default=0)
+
+
+def _stat_inputs(files: List[str]) -> List[Tuple[str, bool]]:
+    """Check input paths with one stat each, returning (path, is directory) pairs"""
+    inputs = []
     for file_or_dir in files:
-        if not os.path.exists(file_or_dir):
+        try:
+            is_dir = stat.S_ISDIR(os.stat(file_or_dir).st_mode)
+        except (OSError, ValueError):
             logger.warning(f"Path {file_or_dir} does not exist, skipping")
             continue
-
-        if os.path.isdir(file_or_dir):
-            discovered = discover_files_in_directory(file_or_dir)
+        inputs.append((file_or_dir, is_dir))
+    return inputs
+
+
+def _iter_input_files(inputs: List[Tuple[str, bool]]) -> Iterator[Tuple[str, str]]:
+    """Expand input files and directories into (mapped extension, path) pairs"""
+    for file_or_dir, is_dir in inputs:
+        if is_dir:
+            discovered = 0
+            for mapped_ext, file_path in iter_discovered_files(file_or_dir):
+                discovered += 1
+                yield mapped_ext, file_path
             if discovered:
-                logger.info(f"Discovered {len(discovered)} supported files in {file_or_dir}")
-                expanded_files.extend(discovered)
+                logger.info(f"Discovered {discovered} supported files in {file_or_dir}")
             else:
                 logger.warning(f"No supported files found in directory {file_or_dir}")
         else:
-            expanded_files.append(file_or_dir)
-
-    # Group files by their file extension
-    file_groups: Dict[str, List[str]] = {}
-
-    for file in expanded_files:
-        file_path = Path(file)
-        ext = file_path.suffix.lower()
-
-        # Handle special cases for file mapping
-        mapped_ext = ext
-
-        # Special case: Justfile files
-        if file_path.name.lower() in ["justfile", "justfile.just"]:
-            mapped_ext = "justfile"
-
-        # Special case: GitHub Actions workflow files
-        if ext in [".yml", ".yaml"] and ".github/workflows" in str(file_path):
-            mapped_ext = ".github-workflow"
-
-        # Check if we have configuration for this extension based on mode
-        has_config = False
-        if mode == Mode.LINT:
-            has_config = mapped_ext in LINTER_MAP
-        elif mode == Mode.FORMAT:
-            has_config = mapped_ext in FORMATTER_MAP
-        elif mode == Mode.BOTH:
-            has_config = mapped_ext in LINTER_MAP or mapped_ext in FORMATTER_MAP
-
-        if has_config:
-            if mapped_ext not in file_groups:
-                file_groups[mapped_ext] = []
+            yield classify_file(file_or_dir), file_or_dir
+
+
+def _is_portable_ignore(pattern: str) -> bool:
+    """Check if an ignore pattern means the same to a tool's exclude flag as to us.
+
+    Only a bare name or a `*.suffix` does: anything with a separator is matched
+    relative to a different root by each side.
+    """
+    if "/" in pattern or os.sep in pattern:
+        return False
+    if pattern.startswith("*"):
+        pattern = pattern[1:]
+    return set(pattern).isdisjoint("*?[")
+
+
+def _directory_ignores(input_directories: List[str]) -> Optional[Tuple[str, ...]]:
+    """Get the custom ignores a tool given the input directories would have to apply.
+
+    Returns None if there are ignores that a tool's exclude flag can't reproduce.
+    """
+    # Each directory is walked with the config that applies to it, so a single
+    # set of exclude flags can only stand in for them if they all agree
+    ignore_sets = {tuple(load_config(d).get("ignore", [])) for d in input_directories}
+    if not ignore_sets:
+        return ()
+    if len(ignore_sets) > 1:
+        return None
+    ignore_patterns = ignore_sets.pop()
+    if not all(map(_is_portable_ignore, ignore_patterns)):
+        return None
+    return ignore_patterns
+
+
+def _directory_extensions(
+    mode: Mode, scan_security: bool, ignore_patterns: Optional[Tuple[str, ...]]
+) -> Optional[Set[str]]:
+    """Get the extensions that will be run, if all of their tools accept directories"""
+    extensions = set()
+    for ext in MODE_EXTENSIONS[mode]:
+        if ext == ".security" and not scan_security:
+            continue
+        for resolve in MODE_RESOLVERS[mode]:
+            command = resolve(ext)
+            if command is None:
+                continue
+            if not command.accepts_directories(ignore_patterns):
+                return None
+            extensions.add(ext)
+    return extensions
+
+
+def collect_command_batches(
+    files: List[str], mode: Mode
+) -> Dict[Tuple[str, Tuple[str, ...]], List[str]]:
+    """Group files into the batched commands to run for them in the specified mode"""
+    input_paths = _stat_inputs(files)
+
+    # Track which inputs were directories for potential direct passing to formatters
+    input_directories = [path for path, is_dir in input_paths if is_dir]
+
+    # Check for custom ignore patterns (beyond the defaults). They only apply to
+    # walking directories, so explicit files don't need any config looked up.
+    ignore_patterns = _directory_ignores(input_directories)
+
+    # Add files to the security scanning group if trufflehog is available, we're
+    # linting, and we're scanning a single directory (not individual files)
+    scan_security = (
+        mode in [Mode.LINT, Mode.BOTH]
+        and is_command_available("trufflehog")
+        and len(input_directories) == 1
+        and len(files) == 1
+    )
+
+    configured_extensions = MODE_EXTENSIONS[mode]
+
+    # If every tool that would run takes the directories themselves, the walk only
+    # has to find one file for each of those extensions and can stop there. That's
+    # only safe if it can't find files to warn about, which needs a tool for every
+    # extension the walk turns up.
+    pending_extensions = None
+    if (
+        input_directories
+        and len(input_directories) == len(files)
+        and configured_extensions == SUPPORTED_EXTENSIONS
+        and not is_command_available("trufflehog")
+    ):
+        pending_extensions = _directory_extensions(mode, scan_security, ignore_patterns)
+
+    # Group files by their mapped extension, as directories are expanded
+    file_groups: DefaultDict[str, List[str]] = defaultdict(list)
+
+    for mapped_ext, file in _iter_input_files(input_paths):
+        if mapped_ext in configured_extensions:
             file_groups[mapped_ext].append(file)
         else:
-            logger.warning(f"No linter configured for file {file} (extension: {ext})")
-
-        # Add to security scanning group if trufflehog is available, we're linting,
-        # and we're scanning a single directory (not individual files)
-        if (
-            mode in [Mode.LINT, Mode.BOTH]
-            and is_command_available("trufflehog")
-            and len(input_directories) == 1
-            and len(files) == 1
+            ext = os.path.splitext(file)[1].lower()
+            logger.warning("No linter configured for file %s (extension: %s)", file, ext)
+
+        # The mapped extension is the file's own one, except that workflows are YAML
+        if scan_security and (
+            mapped_ext in SECURITY_EXTENSIONS
+            or mapped_ext == ".github-workflow"
+            or os.path.basename(file).startswith(".env")
         ):
-            security_extensions = {
-                ".py",
-                ".js",
-                ".jsx",
-                ".ts",
-                ".tsx",
-                ".go",
-                ".rs",
-                ".rb",
-                ".php",
-                ".sh",
-                ".bash",
-                ".zsh",
-                ".yaml",
-                ".yml",
-                ".json",
-                ".toml",
-                ".tf",
-                ".tfvars",
-                ".env",
-                ".txt",
-                ".md",
-                ".sql",
-                ".xml",
-                ".html",
-                ".css",
-            }
-            if ext in security_extensions or file_path.name.startswith(".env"):
-                if ".security" not in file_groups:
-                    file_groups[".security"] = []
-                file_groups[".security"].append(file)
+            file_groups[".security"].append(file)
+
+        if pending_extensions is not None:
+            pending_extensions.difference_update(file_groups)
+            if not pending_extensions:
+                logger.info("Stopped discovery early: all tools take directories")
+                break
 
     # Check if any files will be processed
     if not file_groups:
         logger.info("No supported files provided, no files were linted")
-        return 0
+        return {}
 
     # Batch commands by their command signature to avoid duplicate runs
-    command_batches: Dict[Tuple[str, Tuple[str, ...]], List[str]] = {}
+    command_batches: DefaultDict[Tuple[str, Tuple[str, ...]], List[str]] = defaultdict(list)
 
     # Collect all commands that would be run
     for ext, file_list in file_groups.items():
-        # Process linting commands
-        if mode in [Mode.LINT, Mode.BOTH] and ext in LINTER_MAP:
-            for linter_cmd in LINTER_MAP[ext]:
-                if linter_cmd.available():
-                    # Use directory if supported and no custom ignores
-                    inputs = file_list
-                    if (
-                        input_directories
-                        and not has_custom_ignores
-                        and linter_cmd.supports_directories
-                    ):
-                        inputs = input_directories
-
-                    cmd, args = linter_cmd.command(inputs)
-                    # Create a signature excluding the file arguments
-                    base_args = [arg for arg in args if arg not in inputs]
-                    cmd_signature = (cmd, tuple(base_args))
-
-                    if cmd_signature not in command_batches:
-                        command_batches[cmd_signature] = []
-                    command_batches[cmd_signature].extend(inputs)
-                    break  # Only use the first available command
-
-        # Process formatting commands
-        if mode in [Mode.FORMAT, Mode.BOTH] and ext in FORMATTER_MAP:
-            for formatter_cmd in FORMATTER_MAP[ext]:
-                if formatter_cmd.available():
-                    # Use directory if supported and no custom ignores
-                    inputs = file_list
-                    if (
-                        input_directories
-                        and not has_custom_ignores
-                        and formatter_cmd.supports_directories
-                    ):
-                        inputs = input_directories
-
-                    cmd, args = formatter_cmd.command(inputs)
-                    # Create a signature excluding the file arguments
-                    base_args = [arg for arg in args if arg not in inputs]
-                    cmd_signature = (cmd, tuple(base_args))
-
-                    if cmd_signature not in command_batches:
-                        command_batches[cmd_signature] = []
-                    command_batches[cmd_signature].extend(inputs)
-                    break  # Only use the first available command
-
-    # Execute batched commands
-    exit_code = 0
-
-    # Use ThreadPoolExecutor for parallel processing
-    with ThreadPoolExecutor(max_workers=min(len(command_batches), os.cpu_count() or 1)) as executor:
-        # Submit all batched commands for processing
-        future_to_cmd = {
-            executor.submit(
-                execute_batched_command,
-                cmd_signature,
-                file_list,
-            ): cmd_signature
-            for cmd_signature, file_list in command_batches.items()
-        }
-
-        # Collect results as they complete
-        for future in as_completed(future_to_cmd):
-            cmd_signature = future_to_cmd[future]
-            try:
-                result = future.result()
-                if result != 0:
-                    exit_code = result
-            except Exception as e:
-                with output_lock:
-                    logger.error(f"Error executing {cmd_signature[0]}: {e}")
-                exit_code = 1
+        for resolve in MODE_RESOLVERS[mode]:
+            command = resolve(ext)
+            if command is None:
+                continue
 
-    return exit_code
+            cmd_signature = command.signature()
+
+            # Use directory if supported and the tool can apply any custom ignores itself
+            inputs = file_list
+            if input_directories and command.accepts_directories(ignore_patterns):
+                inputs = input_directories
+                if ignore_patterns and command.exclude_flag:
+                    cmd, args = cmd_signature
+                    for pattern in ignore_patterns:
+                        args += (command.exclude_flag, pattern)
+                    cmd_signature = (cmd, args)
+
+            command_batches[cmd_signature].extend(inputs)
+
+    return command_batches
+
+
+def run_batches(command_batches: Dict[Tuple[str, Tuple[str, ...]], List[str]]) -> int:
+    """Execute batched commands concurrently, returning the overall exit code"""
+    import asyncio
+
+    if not command_batches:
+        return 0
+    return asyncio.run(execute_batches(command_batches))
+
+
+def run_files(files: List[str], mode: Mode) -> int:
+    """Process files from the command line.
+
+    When only one command line needs running, this process is handed off to the tool
+    where possible rather than waiting on it as a child, and doesn't return. Otherwise
+    the batches are run as usual.
+    """
+    command_batches = collect_command_batches(files, mode)
+    if len(command_batches) == 1:
+        exec_batched_command(*next(iter(command_batches.items())))
+    return run_batches(command_batches)
 
 
 def analyze_project_files(directory: str = ".") -> Dict[str, Set[str]]:
@@ -1194,20 +1176,9 @@ def analyze_project_files(directory: str = ".") -> Dict[str, Set[str]]:
     found_extensions = set()
 
     # Discover all files in the project
-    all_files = discover_files_in_directory(directory)
-
-    # Extract extensions and special cases
-    for file_path_str in all_files:
-        file_path = Path(file_path_str)
-        ext = file_path.suffix.lower()
-
-        # Handle special cases
-        if file_path.name.lower() in ["justfile", "justfile.just"]:
-            found_extensions.add("justfile")
-        elif ext in [".yml", ".yaml"] and ".github/workflows" in str(file_path):
-            found_extensions.add(".github-workflow")
-        elif ext:
-            found_extensions.add(ext)
+    for mapped_ext, _ in iter_discovered_files(directory):
+        if mapped_ext:
+            found_extensions.add(mapped_ext)
 
     # Group by available vs missing tools
     result = {
@@ -1221,26 +1192,14 @@ def analyze_project_files(directory: str = ".") -> Dict[str, Set[str]]:
     for ext in found_extensions:
         # Check linters
         if ext in LINTER_MAP:
-            available_linter = None
-            for linter_cmd in LINTER_MAP[ext]:
-                if linter_cmd.available():
-                    available_linter = linter_cmd
-                    break
-
-            if available_linter:
+            if resolve_linter(ext):
                 result["available_linters"].add(ext)
             else:
                 result["missing_linters"].add(ext)
 
         # Check formatters
         if ext in FORMATTER_MAP:
-            available_formatter = None
-            for formatter_cmd in FORMATTER_MAP[ext]:
-                if formatter_cmd.available():
-                    available_formatter = formatter_cmd
-                    break
-
-            if available_formatter:
+            if resolve_formatter(ext):
                 result["available_formatters"].add(ext)
             else:
                 result["missing_formatters"].add(ext)
@@ -1248,72 +1207,73 @@ def analyze_project_files(directory: str = ".") -> Dict[str, Set[str]]:
     return result
 
 
+# Map extensions to their primary recommended tools
+TOOL_RECOMMENDATIONS: Dict[str, Tuple[str, ...]] = {
+    ".py": ("ruff", "black"),
+    ".js": ("eslint", "prettier"),
+    ".jsx": ("eslint", "prettier"),
+    ".ts": ("eslint", "tsc", "prettier"),
+    ".tsx": ("eslint", "tsc", "prettier"),
+    ".go": ("gofmt",),
+    ".rs": ("rustfmt",),
+    ".rb": ("rubocop",),
+    ".php": ("php-cs-fixer",),
+    ".sh": ("shellcheck", "shfmt"),
+    ".bash": ("shellcheck", "shfmt"),
+    ".zsh": ("shellcheck", "shfmt"),
+    ".json": ("prettier",),
+    ".css": ("prettier",),
+    ".scss": ("prettier",),
+    ".html": ("prettier",),
+    ".md": ("prettier",),
+    ".yaml": ("yamllint", "prettier"),
+    ".yml": ("yamllint", "prettier"),
+    ".toml": ("taplo",),
+    ".tf": ("terraform", "tflint"),
+    ".tfvars": ("terraform", "tflint"),
+    ".github-workflow": ("actionlint", "yamllint", "prettier"),
+    "justfile": ("just",),
+    ".security": ("trufflehog",),
+}
+
+# Installation commands for different tools
+INSTALL_COMMANDS: Dict[str, str] = {
+    "ruff": "pip install ruff",
+    "black": "pip install black",
+    "eslint": "npm install -g eslint",
+    "prettier": "npm install -g prettier",
+    "tsc": "npm install -g typescript",
+    "gofmt": "install Go",
+    "rustfmt": "install Rust",
+    "rubocop": "gem install rubocop",
+    "php-cs-fixer": "composer global require friendsofphp/php-cs-fixer",
+    "shellcheck": "brew install shellcheck (macOS) or apt install shellcheck (Ubuntu)",
+    "shfmt": "brew install shfmt (macOS) or go install mvdan.cc/sh/v3/cmd/shfmt@latest",
+    "yamllint": "pip install yamllint",
+    "taplo": "brew install taplo (macOS) or cargo install taplo-cli",
+    "terraform": "https://terraform.io/downloads",
+    "tflint": "brew install tflint (macOS) or https://github.com/terraform-linters/tflint",
+    "actionlint": (
+        "brew install actionlint (macOS) or go install github.com/rhymond/actionlint@latest"
+    ),
+    "just": "brew install just (macOS) or cargo install just",
+    "trufflehog": (
+        "brew install trufflehog (macOS) or "
+        "go install github.com/trufflesecurity/trufflehog/v3@latest"
+    ),
+}
+
+
 def get_tool_suggestions(extensions: Set[str]) -> Dict[str, List[str]]:
     """Get tool installation suggestions for missing extensions"""
     suggestions = {}
 
-    # Map extensions to their primary recommended tools
-    tool_recommendations = {
-        ".py": ["ruff", "black"],
-        ".js": ["eslint", "prettier"],
-        ".jsx": ["eslint", "prettier"],
-        ".ts": ["eslint", "tsc", "prettier"],
-        ".tsx": ["eslint", "tsc", "prettier"],
-        ".go": ["gofmt"],
-        ".rs": ["rustfmt"],
-        ".rb": ["rubocop"],
-        ".php": ["php-cs-fixer"],
-        ".sh": ["shellcheck", "shfmt"],
-        ".bash": ["shellcheck", "shfmt"],
-        ".zsh": ["shellcheck", "shfmt"],
-        ".json": ["prettier"],
-        ".css": ["prettier"],
-        ".scss": ["prettier"],
-        ".html": ["prettier"],
-        ".md": ["prettier"],
-        ".yaml": ["yamllint", "prettier"],
-        ".yml": ["yamllint", "prettier"],
-        ".toml": ["taplo"],
-        ".tf": ["terraform", "tflint"],
-        ".tfvars": ["terraform", "tflint"],
-        ".github-workflow": ["actionlint", "yamllint", "prettier"],
-        "justfile": ["just"],
-        ".security": ["trufflehog"],
-    }
-
-    # Installation commands for different tools
-    install_commands = {
-        "ruff": "pip install ruff",
-        "black": "pip install black",
-        "eslint": "npm install -g eslint",
-        "prettier": "npm install -g prettier",
-        "tsc": "npm install -g typescript",
-        "gofmt": "install Go",
-        "rustfmt": "install Rust",
-        "rubocop": "gem install rubocop",
-        "php-cs-fixer": "composer global require friendsofphp/php-cs-fixer",
-        "shellcheck": "brew install shellcheck (macOS) or apt install shellcheck (Ubuntu)",
-        "shfmt": "brew install shfmt (macOS) or go install mvdan.cc/sh/v3/cmd/shfmt@latest",
-        "yamllint": "pip install yamllint",
-        "taplo": "brew install taplo (macOS) or cargo install taplo-cli",
-        "terraform": "https://terraform.io/downloads",
-        "tflint": "brew install tflint (macOS) or https://github.com/terraform-linters/tflint",
-        "actionlint": (
-            "brew install actionlint (macOS) or go install github.com/rhymond/actionlint@latest"
-        ),
-        "just": "brew install just (macOS) or cargo install just",
-        "trufflehog": (
-            "brew install trufflehog (macOS) or "
-            "go install github.com/trufflesecurity/trufflehog/v3@latest"
-        ),
-    }
-
     for ext in extensions:
-        if ext in tool_recommendations:
+        if ext in TOOL_RECOMMENDATIONS:
             ext_suggestions = []
-            for tool in tool_recommendations[ext]:
+            for tool in TOOL_RECOMMENDATIONS[ext]:
                 if not is_command_available(tool):
-                    install_cmd = install_commands.get(tool, f"install {tool}")
+                    install_cmd = INSTALL_COMMANDS.get(tool, f"install {tool}")
                     ext_suggestions.append(f"{tool}: {install_cmd}")
 
             if ext_suggestions:
@@ -1341,19 +1301,12 @@ def suggest_tools() -> int:
         all_available = analysis["available_linters"] | analysis["available_formatters"]
         for ext in sorted(all_available):
             tools = []
-            if ext in LINTER_MAP:
-                for linter_cmd in LINTER_MAP[ext]:
-                    if linter_cmd.available():
-                        cmd, _ = linter_cmd.command([])
-                        tools.append(cmd)
-                        break
-            if ext in FORMATTER_MAP:
-                for formatter_cmd in FORMATTER_MAP[ext]:
-                    if formatter_cmd.available():
-                        cmd, _ = formatter_cmd.command([])
-                        if cmd not in tools:
-                            tools.append(cmd)
-                        break
+            linter_cmd = resolve_linter(ext)
+            if linter_cmd:
+                tools.append(linter_cmd.tool)
+            formatter_cmd = resolve_formatter(ext)
+            if formatter_cmd and formatter_cmd.tool not in tools:
+                tools.append(formatter_cmd.tool)
             print(f"  {ext}: {', '.join(tools)}")
 
     # Show suggested installations
@@ -1375,6 +1328,8 @@ def suggest_tools() -> int:
 
 def docker_run(args: List[str]) -> int:
     """Run taidy in Docker container with all tools pre-installed"""
+    import subprocess
+
     docker_image = "taidy:latest"
 
     # Check if Docker is available
@@ -1441,55 +1396,49 @@ def docker_run(args: List[str]) -> int:
         return 1
 
 
+# Flags that print information and exit
+_FLAG_HANDLERS: Dict[str, Callable[[], None]] = {
+    "-v": show_version,
+    "--version": show_version,
+    "-h": show_help,
+    "--help": show_help,
+}
+
+# Subcommands that need at least one further argument, which they're called with
+_SUBCOMMANDS: Dict[str, Callable[[List[str]], int]] = {
+    "lint": functools.partial(run_files, mode=Mode.LINT),
+    "format": functools.partial(run_files, mode=Mode.FORMAT),
+    "docker": docker_run,
+}
+
+
 def main() -> None:
     """Main entry point"""
-    setup_logging()
-
     if len(sys.argv) < 2:
         show_usage()
         sys.exit(1)
 
-    # Handle version and help flags
+    # Handle version and help flags, which don't log anything
     arg = sys.argv[1]
-    if arg in ["-v", "--version"]:
-        show_version()
-        sys.exit(0)
-    elif arg in ["-h", "--help"]:
-        show_help()
+    handler = _FLAG_HANDLERS.get(arg)
+    if handler:
+        handler()
         sys.exit(0)
 
-    # Parse command and files
-    mode = Mode.BOTH
-    files = []
-
-    if sys.argv[1] == "lint":
-        mode = Mode.LINT
-        if len(sys.argv) < 3:
-            show_usage()
-            sys.exit(1)
-        files = sys.argv[2:]
-    elif sys.argv[1] == "format":
-        mode = Mode.FORMAT
-        if len(sys.argv) < 3:
-            show_usage()
-            sys.exit(1)
-        files = sys.argv[2:]
-    elif sys.argv[1] == "suggest":
-        exit_code = suggest_tools()
-        sys.exit(exit_code)
-    elif sys.argv[1] == "docker":
-        if len(sys.argv) < 3:
-            show_usage()
-            sys.exit(1)
-        exit_code = docker_run(sys.argv[2:])
-        sys.exit(exit_code)
-    else:
+    setup_logging()
+
+    if arg == "suggest":
+        sys.exit(suggest_tools())
+
+    subcommand = _SUBCOMMANDS.get(arg)
+    if subcommand is None:
         # No subcommand, treat first arg as file
-        mode = Mode.BOTH
-        files = sys.argv[1:]
+        sys.exit(run_files(sys.argv[1:], Mode.BOTH))
 
-    exit_code = process_files(files, mode)
-    sys.exit(exit_code)
+    if len(sys.argv) < 3:
+        show_usage()
+        sys.exit(1)
+    sys.exit(subcommand(sys.argv[2:]))
 
 
 if __name__ == "__main__":
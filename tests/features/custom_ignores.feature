@@ -0,0 +1,39 @@
+Feature: Custom ignore patterns from .taidy.json
+
+  Scenario: A directory's own ignore patterns apply when it is linted
+    Given ruff is installed
+    And the file "project/.taidy.json" contains:
+      """
+      {"ignore": ["generated"]}
+      """
+    And the file "project/src/clean.py" contains:
+      """
+      x = 1
+      """
+    And the file "project/generated/unused_import.py" contains:
+      """
+      import os
+      """
+    When `taidy lint project` is run
+    Then the ruff command should be executed
+    And the output should not contain "unused_import.py"
+    And the exit code should be 0
+
+  Scenario: Path ignore patterns apply when a directory is linted
+    Given ruff is installed
+    And the file ".taidy.json" contains:
+      """
+      {"ignore": ["project/generated/*"]}
+      """
+    And the file "project/src/clean.py" contains:
+      """
+      x = 1
+      """
+    And the file "project/generated/unused_import.py" contains:
+      """
+      import os
+      """
+    When `taidy lint project` is run
+    Then the ruff command should be executed
+    And the output should not contain "unused_import.py"
+    And the exit code should be 0
@@ -5,6 +5,7 @@ import (
 	"flag"
 	"fmt"
 	"os"
+	"runtime"
 
 	"github.com/cucumber/godog"
 	"github.com/cucumber/godog/colors"
@@ -14,8 +15,8 @@ var opts = godog.Options{
 	Output:      colors.Colored(os.Stdout),
 	Format:      "progress", // better for parallel execution
 	Paths:       []string{"features"},
-	Randomize:   0, // randomize scenario execution order
-	Concurrency: 4, // run scenarios in parallel
+	Randomize:   0,                // randomize scenario execution order
+	Concurrency: runtime.NumCPU(), // run scenarios in parallel
 }
 
 func init() {
@@ -28,7 +29,7 @@ func InitializeTestSuite(ctx *godog.TestSuiteContext) {
 	})
 
 	ctx.AfterSuite(func() {
-		// Test suite completed silently
+		DrainContainerPool()
 	})
 }
 
@@ -5,9 +5,11 @@ import (
 	"fmt"
 	"log"
 	"os/exec"
+	"path/filepath"
 	"regexp"
 	"strconv"
 	"strings"
+	"sync"
 
 	"github.com/cucumber/godog"
 )
@@ -39,7 +41,7 @@ func NewTestContainerTestContext() *TestContainerTestContext {
 // Close cleans up the test context
 func (tctx *TestContainerTestContext) Close() error {
 	if tctx.currentContainer != nil {
-		tctx.currentContainer.StopContainer()
+		tctx.currentContainer.ReleaseContainer()
 	}
 	return tctx.containerManager.Close()
 }
@@ -839,6 +841,41 @@ func (tctx *TestContainerTestContext) taidyPoorlyFormattedmdIsRun() error {
 	return nil
 }
 
+func (tctx *TestContainerTestContext) theFileContains(filename string, docString *godog.DocString) error {
+	if tctx.currentContainer == nil {
+		return fmt.Errorf("no container available for testing")
+	}
+
+	// Files are created relative to the container's working directory
+	if dir := filepath.Dir(filename); dir != "." {
+		if _, err := tctx.currentContainer.ExecuteCommand(fmt.Sprintf("mkdir -p /tmp/%s", dir)); err != nil {
+			return fmt.Errorf("failed to create directory %s: %w", dir, err)
+		}
+	}
+
+	content := ""
+	if docString != nil {
+		content = docString.Content + "\n"
+	}
+
+	return tctx.currentContainer.CreateFile(filename, content)
+}
+
+func (tctx *TestContainerTestContext) taidyLintProjectIsRun() error {
+	if tctx.currentContainer == nil {
+		return fmt.Errorf("no container available for testing")
+	}
+
+	cmd := "python3 -m taidy lint project"
+	result, err := tctx.currentContainer.ExecuteCommand(cmd)
+	if err != nil {
+		return fmt.Errorf("failed to execute taidy lint project: %w", err)
+	}
+
+	tctx.commandResult = result
+	return nil
+}
+
 // Helper functions for executing commands on the host system
 func executeHostCommand(name string, args ...string) (string, error) {
 	cmd := exec.Command(name, args...)
@@ -965,7 +1002,11 @@ func (tctx *TestContainerTestContext) dockerIsAvailable() error {
 	return nil
 }
 
-func (tctx *TestContainerTestContext) theDockerImageIsBuilt() error {
+// imageMu serializes building the taidy image, as concurrent scenarios share its tag
+var imageMu sync.Mutex
+
+// buildDockerImage builds the taidy image, and must be called with imageMu held
+func buildDockerImage() error {
 	// Build the Docker image from project root (parent directory)
 	_, err := executeHostCommand("docker", "build", "-t", "taidy:latest", "..")
 	if err != nil {
@@ -974,6 +1015,12 @@ func (tctx *TestContainerTestContext) theDockerImageIsBuilt() error {
 	return nil
 }
 
+func (tctx *TestContainerTestContext) theDockerImageIsBuilt() error {
+	imageMu.Lock()
+	defer imageMu.Unlock()
+	return buildDockerImage()
+}
+
 func (tctx *TestContainerTestContext) theImageBuildShouldSucceed() error {
 	// Check if the image exists
 	_, err := executeHostCommand("docker", "image", "inspect", "taidy:latest")
@@ -997,11 +1044,14 @@ func (tctx *TestContainerTestContext) theImageShouldContainAllRequiredTools() er
 }
 
 func (tctx *TestContainerTestContext) theDockerImageExists() error {
+	imageMu.Lock()
+	defer imageMu.Unlock()
+
 	// Ensure the Docker image exists (build it if needed)
 	_, err := executeHostCommand("docker", "image", "inspect", "taidy:latest")
 	if err != nil {
 		// Try to build the image
-		return tctx.theDockerImageIsBuilt()
+		return buildDockerImage()
 	}
 	return nil
 }
@@ -1044,6 +1094,7 @@ func (tctx *TestContainerTestContext) InitializeScenario(ctx *godog.ScenarioCont
 	ctx.Step(`^the markdown file "([^"]*)" exists$`, tctx.theMarkdownFileExists)
 	ctx.Step(`^the following JavaScript file exists:$`, tctx.theFollowingJavaScriptFileExists)
 	ctx.Step(`^the following Go file exists:$`, tctx.theFollowingGoFileExists)
+	ctx.Step(`^the file "([^"]*)" contains:$`, tctx.theFileContains)
 
 	// Linter verification steps
 	ctx.Step(`^([a-zA-Z0-9_-]+) is installed$`, tctx.linterIsInstalled)
@@ -1092,6 +1143,7 @@ func (tctx *TestContainerTestContext) InitializeScenario(ctx *godog.ScenarioCont
 	// Security scanning steps
 	ctx.Step(`^`+"`"+`taidy lint with_secret\.py`+"`"+` is run$`, tctx.taidyLintWithSecretPyIsRun)
 	ctx.Step(`^`+"`"+`taidy lint \.`+"`"+` is run in the sample_files directory$`, tctx.taidyLintDotIsRunInTheSampleFilesDirectory)
+	ctx.Step(`^`+"`"+`taidy lint project`+"`"+` is run$`, tctx.taidyLintProjectIsRun)
 	ctx.Step(`^security scanning output is emitted$`, tctx.securityScanningOutputIsEmitted)
 	ctx.Step(`^secrets are detected in the output$`, tctx.secretsAreDetectedInTheOutput)
 	ctx.Step(`^no security scanning output is emitted$`, tctx.noSecurityScanningOutputIsEmitted)
@@ -1113,7 +1165,7 @@ func (tctx *TestContainerTestContext) InitializeScenario(ctx *godog.ScenarioCont
 
 	ctx.After(func(ctx context.Context, sc *godog.Scenario, err error) (context.Context, error) {
 		if tctx.currentContainer != nil {
-			tctx.currentContainer.StopContainer()
+			tctx.currentContainer.ReleaseContainer()
 			tctx.currentContainer = nil
 		}
 		tctx.testFiles = tctx.testFiles[:0] // Clear slice
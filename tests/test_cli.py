@@ -0,0 +1,42 @@
+"""Unit tests for taidy's command line handling"""
+
+import os
+
+from taidy import cli
+
+
+def test_chunk_argv_budgets_encoded_bytes(monkeypatch):
+    """Multi-byte file names are measured in bytes, not characters"""
+    budget = 1024
+    monkeypatch.setattr(cli, "_argv_budget", lambda: budget)
+
+    # Each "é" is one character but two bytes in UTF-8
+    files = [f"src/{'é' * 40}_{i}.py" for i in range(50)]
+    base_argv = ["ruff", "check"]
+
+    chunks = list(cli._chunk_argv(base_argv, files))
+
+    assert len(chunks) > 1
+    for argv in chunks:
+        assert argv[: len(base_argv)] == base_argv
+        assert sum(len(os.fsencode(arg)) + 1 + 8 for arg in argv) <= budget
+    assert [file for argv in chunks for file in argv[len(base_argv) :]] == files
+
+
+def test_batched_argvs_keeps_cross_file_checks_together(monkeypatch):
+    """Large batches are split across CPUs, except for tools that check files together"""
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    files = [f"file_{i}.ts" for i in range(400)]
+
+    assert len(cli._batched_argvs(("yamllint", ("-s",)), files)) == 4
+    assert len(cli._batched_argvs(("tsc", ("--noEmit",)), files)) == 1
+    assert len(cli._batched_argvs(("pylint", ("--quiet",)), files)) == 1
+
+
+def test_batched_argvs_keeps_parallel_tools_together(monkeypatch):
+    """Tools that already use every CPU aren't split into one command line per CPU"""
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    files = [f"file_{i}.py" for i in range(400)]
+
+    assert len(cli._batched_argvs(("black", ("--check", "--quiet")), files)) == 1
+    assert len(cli._batched_argvs(("flake8", ("--quiet",)), files)) == 1
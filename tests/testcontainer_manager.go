@@ -6,6 +6,7 @@ import (
 	"io"
 	"os"
 	"path/filepath"
+	"sync"
 	"time"
 
 	"github.com/testcontainers/testcontainers-go"
@@ -32,6 +33,69 @@ type TestContainerContext struct {
 	scenarioName string
 }
 
+// containerPool holds started containers that have finished a scenario, by environment,
+// so that later scenarios can reuse them rather than building and starting new ones
+type containerPool struct {
+	mu   sync.Mutex
+	idle map[string][]testcontainers.Container
+}
+
+var pool = &containerPool{idle: make(map[string][]testcontainers.Container)}
+
+// acquire takes an idle container for the environment, or returns nil if there isn't one
+func (p *containerPool) acquire(environment string) testcontainers.Container {
+	for {
+		p.mu.Lock()
+		idle := p.idle[environment]
+		if len(idle) == 0 {
+			p.mu.Unlock()
+			return nil
+		}
+		container := idle[len(idle)-1]
+		p.idle[environment] = idle[:len(idle)-1]
+		p.mu.Unlock()
+
+		if container.IsRunning() {
+			return container
+		}
+		container.Terminate(context.Background())
+	}
+}
+
+// release resets a container and makes it available to later scenarios
+func (p *containerPool) release(environment string, container testcontainers.Container) {
+	// Remove everything the scenario created, so the next one starts from a clean slate
+	exitCode, _, err := container.Exec(context.Background(),
+		[]string{"sh", "-c", "find /tmp -mindepth 1 -delete"})
+	if err != nil || exitCode != 0 {
+		container.Terminate(context.Background())
+		return
+	}
+
+	p.mu.Lock()
+	defer p.mu.Unlock()
+	p.idle[environment] = append(p.idle[environment], container)
+}
+
+// drain terminates all idle containers
+func (p *containerPool) drain() {
+	p.mu.Lock()
+	idle := p.idle
+	p.idle = make(map[string][]testcontainers.Container)
+	p.mu.Unlock()
+
+	for _, containers := range idle {
+		for _, container := range containers {
+			container.Terminate(context.Background())
+		}
+	}
+}
+
+// DrainContainerPool terminates the containers kept for reuse, once no more scenarios will run
+func DrainContainerPool() {
+	pool.drain()
+}
+
 // NewTestContainerManager creates a new testcontainer manager
 func NewTestContainerManager() (*TestContainerManager, error) {
 	return &TestContainerManager{
@@ -172,8 +236,16 @@ WORKDIR /tmp`, nil
 	}
 }
 
-// NewTestContainerContext creates a new container context using testcontainers
+// NewTestContainerContext creates a new container context using testcontainers,
+// reusing a container left by an earlier scenario when one is available
 func NewTestContainerContext(environment string, manager *TestContainerManager) (*TestContainerContext, error) {
+	if container := pool.acquire(environment); container != nil {
+		return &TestContainerContext{
+			Container:   container,
+			Environment: environment,
+		}, nil
+	}
+
 	// Get Dockerfile content for the environment
 	dockerfileContent, err := manager.GetDockerfileContent(environment)
 	if err != nil {
@@ -216,7 +288,8 @@ func NewTestContainerContext(environment string, manager *TestContainerManager)
 			// Cache intermediate layers for faster builds
 			BuildArgs: map[string]*string{},
 		},
-		Cmd:        []string{"sleep", "300"},
+		// Kept running for as long as the suite, as containers are reused between scenarios
+		Cmd:        []string{"tail", "-f", "/dev/null"},
 		WaitingFor: wait.ForExec([]string{"echo", "ready"}).WithStartupTimeout(45 * time.Second), // Reduced timeout
 		Labels: map[string]string{
 			"taidy.environment": environment,
@@ -250,6 +323,16 @@ func (tcc *TestContainerContext) SetScenarioName(scenarioName string) {
 	tcc.scenarioName = scenarioName
 }
 
+// ReleaseContainer returns the container to the pool, for a later scenario to reuse
+func (tcc *TestContainerContext) ReleaseContainer() {
+	if tcc.Container == nil {
+		return
+	}
+
+	pool.release(tcc.Environment, tcc.Container)
+	tcc.Container = nil
+}
+
 // StopContainer stops and removes the container
 func (tcc *TestContainerContext) StopContainer() error {
 	if tcc.Container == nil {